@@ -2,15 +2,12 @@ import asyncio
 import json
 import os
 
-import dotenv
 from fastmcp import Client
-from openai import OpenAI
 
 caminho_servidor = 'http://localhost:8080/sse'
-cliente_mcp = Client(caminho_servidor)
 
 
-async def exemplo_analise_basica():
+async def exemplo_analise_basica(cliente_mcp: Client):
     """Exemplo 1: Análise básica de sentimento (top 5 emoções)"""
     print("\n" + "="*80)
     print("EXEMPLO 1: Análise Básica de Sentimento")
@@ -18,15 +15,14 @@ async def exemplo_analise_basica():
 
     texto = "Estou muito feliz e animado com essa nova oportunidade! Mal posso esperar para começar!"
 
-    async with cliente_mcp:
-        resultado = await cliente_mcp.call_tool(
-            "analisar_sentimento",
-            arguments={'texto': texto, 'top_k': 5}
-        )
-        print(resultado[0].text)
+    resultado = await cliente_mcp.call_tool(
+        "analisar_sentimento",
+        arguments={'texto': texto, 'top_k': 5}
+    )
+    print(resultado[0].text)
 
 
-async def exemplo_analise_detalhada():
+async def exemplo_analise_detalhada(cliente_mcp: Client):
     """Exemplo 2: Análise detalhada (todas as 28 emoções)"""
     print("\n" + "="*80)
     print("EXEMPLO 2: Análise Detalhada (Todas as 28 Emoções)")
@@ -34,15 +30,14 @@ async def exemplo_analise_detalhada():
 
     texto = "Estou preocupado com o futuro, mas também esperançoso de que tudo vai dar certo."
 
-    async with cliente_mcp:
-        resultado = await cliente_mcp.call_tool(
-            "analisar_sentimento_detalhado",
-            arguments={'texto': texto}
-        )
-        print(resultado[0].text)
+    resultado = await cliente_mcp.call_tool(
+        "analisar_sentimento_detalhado",
+        arguments={'texto': texto}
+    )
+    print(resultado[0].text)
 
 
-async def exemplo_comparacao():
+async def exemplo_comparacao(cliente_mcp: Client):
     """Exemplo 3: Comparação de múltiplos textos"""
     print("\n" + "="*80)
     print("EXEMPLO 3: Comparação de Sentimentos")
@@ -55,20 +50,23 @@ async def exemplo_comparacao():
         "Obrigado por tudo! Você é incrível!"
     ]
 
-    async with cliente_mcp:
-        resultado = await cliente_mcp.call_tool(
-            "comparar_sentimentos",
-            arguments={'textos': textos}
-        )
-        print(resultado[0].text)
+    resultado = await cliente_mcp.call_tool(
+        "comparar_sentimentos",
+        arguments={'textos': textos}
+    )
+    print(resultado[0].text)
 
 
-async def exemplo_com_openai():
+async def exemplo_com_openai(cliente_mcp: Client):
     """Exemplo 4: Integração com OpenAI para análise contextual"""
     print("\n" + "="*80)
     print("EXEMPLO 4: Análise com Síntese OpenAI")
     print("="*80 + "\n")
 
+    # Importados aqui porque só este exemplo usa a OpenAI
+    import dotenv
+    from openai import OpenAI
+
     dotenv.load_dotenv()
     api_key = os.environ.get('CHAVE_API_OPENAI')
 
@@ -81,47 +79,46 @@ async def exemplo_com_openai():
     Estou nas nuvens, mas também um pouco nervoso com os novos desafios.
     """
 
-    async with cliente_mcp:
-        # Análise de sentimento
-        resultado = await cliente_mcp.call_tool(
-            "analisar_sentimento",
-            arguments={'texto': texto, 'top_k': 5}
-        )
+    # Análise de sentimento
+    resultado = await cliente_mcp.call_tool(
+        "analisar_sentimento",
+        arguments={'texto': texto, 'top_k': 5}
+    )
 
-        analise_sentimento = resultado[0].text
+    analise_sentimento = resultado[0].text
 
-        print("📊 Análise de Sentimento:")
-        print(analise_sentimento)
+    print("📊 Análise de Sentimento:")
+    print(analise_sentimento)
 
-        # Síntese com OpenAI
-        mensagem_sistema = f"""
-        Você é um assistente especializado em análise emocional.
-        Um usuário escreveu o seguinte texto: "{texto}"
+    # Síntese com OpenAI
+    mensagem_sistema = f"""
+    Você é um assistente especializado em análise emocional.
+    Um usuário escreveu o seguinte texto: "{texto}"
 
-        A análise de sentimentos GoEmotions detectou as seguintes emoções:
-        {analise_sentimento}
+    A análise de sentimentos GoEmotions detectou as seguintes emoções:
+    {analise_sentimento}
 
-        Com base nessa análise, forneça:
-        1. Uma interpretação do estado emocional da pessoa
-        2. Insights sobre o que ela pode estar vivenciando
-        3. Sugestões de como ela pode processar essas emoções
+    Com base nessa análise, forneça:
+    1. Uma interpretação do estado emocional da pessoa
+    2. Insights sobre o que ela pode estar vivenciando
+    3. Sugestões de como ela pode processar essas emoções
 
-        Seja empático e construtivo.
-        """
+    Seja empático e construtivo.
+    """
 
-        client = OpenAI(api_key=api_key)
-        response = client.responses.create(
-            model="gpt-4o-mini",
-            instructions=mensagem_sistema,
-            input="Por favor, analise meu estado emocional e me dê algumas orientações.",
-        )
+    client = OpenAI(api_key=api_key)
+    response = client.responses.create(
+        model="gpt-4o-mini",
+        instructions=mensagem_sistema,
+        input="Por favor, analise meu estado emocional e me dê algumas orientações.",
+    )
 
-        print("\n🤖 Síntese e Orientação (OpenAI):")
-        print("-" * 80)
-        print(response.output_text)
+    print("\n🤖 Síntese e Orientação (OpenAI):")
+    print("-" * 80)
+    print(response.output_text)
 
 
-async def exemplo_analise_review():
+async def exemplo_analise_review(cliente_mcp: Client):
     """Exemplo 5: Análise de review de produto"""
     print("\n" + "="*80)
     print("EXEMPLO 5: Análise de Review de Produto")
@@ -133,16 +130,15 @@ async def exemplo_analise_review():
     Me sinto enganado e frustrado. Não recomendo!
     """
 
-    async with cliente_mcp:
-        resultado = await cliente_mcp.call_tool(
-            "analisar_sentimento_detalhado",
-            arguments={'texto': review}
-        )
+    resultado = await cliente_mcp.call_tool(
+        "analisar_sentimento_detalhado",
+        arguments={'texto': review}
+    )
 
-        print("📝 Review analisado:")
-        print(review)
-        print("\n📊 Análise de Emoções:")
-        print(resultado[0].text)
+    print("📝 Review analisado:")
+    print(review)
+    print("\n📊 Análise de Emoções:")
+    print(resultado[0].text)
 
 
 async def main():
@@ -151,12 +147,17 @@ async def main():
     print("ANÁLISE DE SENTIMENTOS COM GoEmotions (28 Emoções)")
     print("🎭" * 40)
 
-    # Executa os exemplos
-    await exemplo_analise_basica()
-    await exemplo_analise_detalhada()
-    await exemplo_comparacao()
-    await exemplo_analise_review()
-    await exemplo_com_openai()
+    # Cria o cliente MCP apenas aqui, e não na importação do módulo
+    cliente_mcp = Client(caminho_servidor)
+
+    # Abre uma única conexão com o servidor e a reaproveita em todos os exemplos
+    # (evita refazer o handshake SSE a cada exemplo)
+    async with cliente_mcp:
+        await exemplo_analise_basica(cliente_mcp)
+        await exemplo_analise_detalhada(cliente_mcp)
+        await exemplo_comparacao(cliente_mcp)
+        await exemplo_analise_review(cliente_mcp)
+        await exemplo_com_openai(cliente_mcp)
 
     print("\n" + "="*80)
     print("✅ Todos os exemplos executados com sucesso!")
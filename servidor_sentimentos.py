@@ -2,8 +2,63 @@
 # IMPORTAÇÕES
 # ============================================================================
 
-# json: biblioteca para trabalhar com formato JSON (serialização/deserialização)
-import json
+# asyncio: usado para executar a inferência (bloqueante) em uma thread separada,
+# sem travar o event loop do servidor MCP
+import asyncio
+
+# threading: trava que impede que o modelo seja carregado duas vezes em paralelo
+import threading
+
+# functools: fornece o lru_cache, usado para memorizar resultados de inferência
+import functools
+
+# hashlib: resumo SHA-256 do modelo ONNX exportado, usado como revisão na chave da cache
+import hashlib
+
+# os: leitura de variáveis de ambiente (configurações opcionais do servidor)
+import os
+
+# shutil / tempfile: exportação do modelo ONNX em um diretório temporário, movido
+# para o lugar definitivo só quando completo
+import shutil
+import tempfile
+
+# Path: manipulação de caminhos de arquivos (usado para o cache do modelo ONNX em disco)
+from pathlib import Path
+
+# THREADS_INFERENCIA: quantas threads de CPU cada inferência pode usar
+# Por padrão o PyTorch usa todos os núcleos em cada chamada; com várias requisições
+# MCP simultâneas isso faz as threads disputarem a CPU e a cache L3. Limitar o número
+# de threads por inferência melhora o throughput sob carga concorrente
+# Por padrão usa até 4 threads, sem passar do número de núcleos da máquina
+# (um contêiner com 2 CPUs não deve criar 4 threads por inferência)
+# Ajustável pela variável de ambiente de mesmo nome
+THREADS_INFERENCIA = int(os.environ.get("THREADS_INFERENCIA", min(4, os.cpu_count() or 1)))
+
+# As bibliotecas numéricas (OpenMP/MKL) leem estas variáveis apenas na importação,
+# por isso elas são definidas antes de importar o torch e o transformers
+# setdefault respeita valores já definidos no ambiente
+# TOKENIZERS_PARALLELISM=false evita que o tokenizer crie suas próprias threads
+# (e os avisos de fork) enquanto o servidor já atende requisições em paralelo
+os.environ.setdefault("OMP_NUM_THREADS", str(THREADS_INFERENCIA))
+os.environ.setdefault("MKL_NUM_THREADS", str(THREADS_INFERENCIA))
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+# orjson: serializador JSON implementado em Rust, bem mais rápido que o módulo json
+# Gera UTF-8 nativamente (acentos em português não são escapados)
+import orjson
+
+# diskcache: cache chave-valor em disco (SQLite), usado para guardar resultados
+# de inferência entre reinicializações do servidor
+import diskcache
+
+# torch: usado para detectar se há GPU (CUDA) disponível e escolher o tipo numérico
+import torch
+
+# Threads do PyTorch: intra-op (dentro de cada operação) limitado a THREADS_INFERENCIA;
+# inter-op em 1, já que o paralelismo entre requisições vem das threads do asyncio.to_thread
+torch.set_num_threads(THREADS_INFERENCIA)
+torch.set_num_interop_threads(1)
 
 # pipeline: função do Transformers (Hugging Face) que facilita o uso de modelos de ML
 # Ela abstrai o processo de tokenização, inferência e pós-processamento
@@ -30,6 +85,50 @@ servidor_mcp = FastMCP('mcp-analise-sentimentos')
 # Usar uma variável global evita recarregar o modelo (operação cara) a cada requisição
 classificador = None
 
+# identificador_modelo: identifica exatamente qual modelo está carregado
+# (nome/caminho, revisão e variante: float32, float16 ou ONNX int8)
+# Faz parte da chave da cache em disco, para que a troca do modelo invalide os resultados
+identificador_modelo = None
+
+# trava_modelo: serializa o carregamento do modelo entre as threads de inferência
+trava_modelo = threading.Lock()
+
+# NOME_MODELO: identificador do modelo GoEmotions no Hugging Face Hub
+NOME_MODELO = "SamLowe/roberta-base-go_emotions"
+
+# DIRETORIO_MODELO_ONNX: onde fica salva a versão ONNX quantizada (int8) do modelo
+# A exportação + quantização é feita uma única vez; nas próximas execuções o
+# modelo é carregado direto deste diretório
+DIRETORIO_MODELO_ONNX = Path(__file__).parent / "modelo_onnx_int8"
+
+# ARQUIVO_RESUMO_ONNX: SHA-256 do modelo quantizado, gravado no fim da exportação
+# Serve de revisão do modelo ONNX na chave da cache em disco (o modelo carregado de
+# um diretório local não tem o commit do Hub)
+ARQUIVO_RESUMO_ONNX = DIRETORIO_MODELO_ONNX / "model_quantized.sha256"
+
+# LIMITE_TOKENS: tamanho máximo (em tokens) de um texto enviado ao modelo
+# Textos maiores são truncados; 512 é o limite de posições do RoBERTa-base
+LIMITE_TOKENS = 512
+
+# OPCOES_JSON: opções do orjson usadas nas respostas
+# Por padrão o JSON sai compacto (o cliente MCP vai reinterpretá-lo de qualquer forma);
+# defina JSON_INDENTADO=1 para respostas indentadas, úteis na depuração
+OPCOES_JSON = orjson.OPT_INDENT_2 if os.environ.get("JSON_INDENTADO") == "1" else 0
+
+# DIRETORIO_CACHE_INFERENCIA: onde fica a cache em disco dos resultados de inferência
+# Pode ser alterado pela variável de ambiente de mesmo nome (ex.: um volume
+# compartilhado entre réplicas do servidor)
+DIRETORIO_CACHE_INFERENCIA = os.environ.get(
+    "DIRETORIO_CACHE_INFERENCIA",
+    str(Path(__file__).parent / "cache_inferencia")
+)
+
+# cache_disco: cache persistente (texto -> emoções) compartilhada entre execuções
+# O modelo é determinístico na inferência, então os resultados não expiram
+# Aberta junto com o modelo (e não na importação), porque cria o diretório e o
+# arquivo SQLite; fica None se o diretório não puder ser usado
+cache_disco = None
+
 # ============================================================================
 # DICIONÁRIO DE TRADUÇÃO
 # ============================================================================
@@ -73,6 +172,100 @@ TRADUCAO_EMOCOES = {
 # FUNÇÃO DE INICIALIZAÇÃO DO MODELO
 # ============================================================================
 
+def carregar_modelo_onnx_quantizado():
+    """
+    Carrega o modelo GoEmotions exportado para ONNX e quantizado em int8.
+
+    Na primeira execução exporta o modelo do Hugging Face para ONNX, aplica
+    quantização dinâmica int8 e salva o resultado em DIRETORIO_MODELO_ONNX.
+    Nas execuções seguintes apenas carrega os arquivos já salvos. Na CPU, o
+    modelo int8 costuma ser de 3 a 5 vezes mais rápido que o original em float32.
+
+    A exportação é feita em um diretório temporário, renomeado para
+    DIRETORIO_MODELO_ONNX apenas no final: uma exportação interrompida (erro de
+    rede, Ctrl+C) nunca deixa um diretório incompleto no lugar do modelo.
+
+    Returns:
+        tuple: (pipeline do Transformers rodando sobre o ONNX Runtime,
+        revisão do modelo no formato "sha256-<resumo do model_quantized.onnx>")
+
+    Raises:
+        ImportError: se o pacote optimum[onnxruntime] não estiver instalado
+    """
+    # Importações feitas aqui porque o optimum é uma dependência opcional
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from onnxruntime import SessionOptions
+    from transformers import AutoTokenizer
+
+    arquivo_quantizado = DIRETORIO_MODELO_ONNX / "model_quantized.onnx"
+
+    # Um diretório sem o arquivo de resumo veio de uma versão anterior do servidor
+    # (ou foi alterado à mão): descarta e exporta de novo
+    if DIRETORIO_MODELO_ONNX.exists() and not ARQUIVO_RESUMO_ONNX.exists():
+        shutil.rmtree(DIRETORIO_MODELO_ONNX)
+
+    # Exporta e quantiza apenas se ainda não existir o modelo em disco
+    if not DIRETORIO_MODELO_ONNX.exists():
+        print("Exportando modelo para ONNX e quantizando em int8 (apenas na primeira vez)...")
+
+        # Diretório temporário ao lado do definitivo (mesmo sistema de arquivos,
+        # para que a renomeação no final seja atômica)
+        diretorio_temporario = Path(tempfile.mkdtemp(
+            prefix=f".{DIRETORIO_MODELO_ONNX.name}-",
+            dir=DIRETORIO_MODELO_ONNX.parent
+        ))
+
+        try:
+            # export=True converte o modelo PyTorch para o formato ONNX
+            modelo_onnx = ORTModelForSequenceClassification.from_pretrained(NOME_MODELO, export=True)
+
+            # Quantização dinâmica (is_static=False): pesos em int8, ativações quantizadas
+            # em tempo de execução, sem precisar de dataset de calibração
+            quantizador = ORTQuantizer.from_pretrained(modelo_onnx)
+            configuracao = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            quantizador.quantize(save_dir=diretorio_temporario, quantization_config=configuracao)
+
+            # Salva o tokenizer junto para não depender do Hub nas próximas cargas
+            AutoTokenizer.from_pretrained(NOME_MODELO).save_pretrained(diretorio_temporario)
+
+            # Resumo do modelo quantizado: identifica exatamente os pesos exportados
+            with open(diretorio_temporario / arquivo_quantizado.name, "rb") as arquivo:
+                resumo = hashlib.file_digest(arquivo, "sha256").hexdigest()
+            (diretorio_temporario / ARQUIVO_RESUMO_ONNX.name).write_text(resumo)
+
+            # Tudo pronto: move o diretório completo para o lugar definitivo
+            diretorio_temporario.rename(DIRETORIO_MODELO_ONNX)
+        finally:
+            # Se algo falhou antes da renomeação, descarta a exportação parcial
+            shutil.rmtree(diretorio_temporario, ignore_errors=True)
+
+    # O ONNX Runtime não usa as configurações de threads do PyTorch; aplica o mesmo limite
+    opcoes_sessao = SessionOptions()
+    opcoes_sessao.intra_op_num_threads = THREADS_INFERENCIA
+    opcoes_sessao.inter_op_num_threads = 1
+
+    modelo = ORTModelForSequenceClassification.from_pretrained(
+        DIRETORIO_MODELO_ONNX,
+        file_name=arquivo_quantizado.name,
+        session_options=opcoes_sessao
+    )
+    tokenizer = AutoTokenizer.from_pretrained(DIRETORIO_MODELO_ONNX)
+    revisao = f"sha256-{ARQUIVO_RESUMO_ONNX.read_text().strip()}"
+
+    classificador_onnx = pipeline(
+        task="text-classification",
+        model=modelo,
+        tokenizer=tokenizer,
+        top_k=28,  # Retorna todas as 28 emoções, já ordenadas por score
+        batch_size=16,
+        truncation=True,  # Corta textos maiores que o limite do modelo...
+        max_length=LIMITE_TOKENS  # ...em LIMITE_TOKENS tokens
+    )
+
+    return classificador_onnx, revisao
+
+
 def inicializar_modelo():
     """
     Inicializa o modelo de classificação de emoções GoEmotions.
@@ -84,24 +277,167 @@ def inicializar_modelo():
     Returns:
         pipeline: Objeto pipeline do Transformers configurado para classificação
     """
-    global classificador  # Acessa a variável global para armazenar o modelo
+    global classificador, identificador_modelo, cache_disco  # Acessa as variáveis globais do modelo
+
+    # Caminho rápido: o modelo já foi carregado anteriormente (singleton pattern)
+    if classificador is not None:
+        return classificador
+
+    # As ferramentas chamam esta função de threads (asyncio.to_thread); a trava garante
+    # que duas primeiras requisições simultâneas não carreguem (ou exportem) o modelo
+    # duas vezes. Quem esperou pela trava encontra o modelo pronto na segunda verificação
+    with trava_modelo:
+        if classificador is not None:
+            return classificador
 
-    # Verifica se o modelo já foi carregado anteriormente (singleton pattern)
-    if classificador is None:
         print("Carregando modelo GoEmotions... (pode levar alguns segundos)")
 
-        # Cria um pipeline de classificação de texto usando o modelo RoBERTa
-        # fine-tuned no dataset GoEmotions
-        classificador = pipeline(
-            task="text-classification",  # Tipo de tarefa: classificar texto em categorias
-            model="SamLowe/roberta-base-go_emotions",  # Modelo do Hugging Face Hub
-            top_k=None  # Retorna todas as 28 emoções com suas probabilidades (não apenas a top-1)
-        )
+        # Usa a primeira GPU se houver CUDA disponível (device=0), senão a CPU (device=-1)
+        # Na GPU o modelo roda em float16 (meia precisão), que é ~2x mais rápido
+        # nos tensor cores; na CPU mantém float32
+        dispositivo = 0 if torch.cuda.is_available() else -1
+        tipo_dados = torch.float16 if dispositivo == 0 else torch.float32
+        variante = str(tipo_dados)
+        revisao = None
+        modelo = None
+
+        # Na CPU, prefere o modelo ONNX quantizado em int8 (se o optimum estiver instalado)
+        if dispositivo == -1:
+            try:
+                modelo, revisao = carregar_modelo_onnx_quantizado()
+                variante = "onnx-int8"
+            except ImportError:
+                print("optimum[onnxruntime] não instalado; usando o modelo PyTorch em float32")
+            except Exception as erro:
+                # Falha na exportação ou na carga do ONNX (rede, disco, versão do optimum...):
+                # o servidor continua funcionando com o modelo PyTorch
+                print(f"Falha ao preparar o modelo ONNX ({erro}); usando o modelo PyTorch em float32")
+
+        if modelo is None:
+            # Cria um pipeline de classificação de texto usando o modelo RoBERTa
+            # fine-tuned no dataset GoEmotions
+            modelo = pipeline(
+                task="text-classification",  # Tipo de tarefa: classificar texto em categorias
+                model=NOME_MODELO,  # Modelo do Hugging Face Hub
+                # Retorna todas as 28 emoções com suas probabilidades (não apenas a top-1)
+                # Com top_k definido, o pipeline já devolve as emoções ordenadas por score
+                top_k=28,
+                device=dispositivo,  # GPU (0) ou CPU (-1)
+                torch_dtype=tipo_dados,  # float16 na GPU, float32 na CPU
+                batch_size=16,  # Tamanho padrão do lote quando recebe uma lista de textos
+                # Trunca a tokenização no limite de posições do RoBERTa; sem isso um texto
+                # muito longo gera um forward pass enorme (custo quadrático no tamanho)
+                truncation=True,
+                max_length=LIMITE_TOKENS
+            )
+
+            # No modelo baixado do Hub, a revisão é o commit do repositório
+            revisao = getattr(modelo.model.config, "_commit_hash", None)
+
+        # Ex.: "SamLowe/roberta-base-go_emotions@<commit>:torch.float32"
+        # ou "SamLowe/roberta-base-go_emotions@sha256-<resumo>:onnx-int8"
+        identificador_modelo = f"{NOME_MODELO}@{revisao}:{variante}"
+
+        # Abre a cache em disco; se o diretório não puder ser criado (sistema de
+        # arquivos somente leitura, sem permissão...), segue só com a cache em memória
+        try:
+            cache_disco = diskcache.Cache(DIRETORIO_CACHE_INFERENCIA)
+        except Exception as erro:
+            print(f"Cache em disco desativada ({erro})")
+
+        # classificador é atribuído por último: o caminho rápido (sem trava) só
+        # enxerga o modelo quando identificador_modelo já está definido
+        classificador = modelo
         print("Modelo carregado com sucesso!")
 
     return classificador
 
 
+@functools.lru_cache(maxsize=1024)
+def inferir_emocoes(texto: str) -> tuple:
+    """
+    Executa o modelo em um único texto, memorizando o resultado.
+
+    O modelo é determinístico na inferência, então textos repetidos (comuns em
+    reviews e conversas) podem reaproveitar o resultado anterior sem um novo
+    forward pass. Há dois níveis de cache: o lru_cache em memória (os 1024
+    textos mais recentes) e a cache_disco, que sobrevive a reinicializações e
+    pode ser compartilhada entre réplicas.
+
+    Args:
+        texto: O texto a ser analisado
+
+    Returns:
+        Tupla de pares (rótulo, score) com as 28 emoções. Usa tuplas porque o
+        valor guardado na cache precisa ser imutável
+    """
+    modelo = inicializar_modelo()
+
+    # A chave inclui o identificador do modelo: resultados de outro modelo
+    # (ou de outra variante, como ONNX int8) nunca são reaproveitados
+    chave = (identificador_modelo, texto)
+    resultado = cache_disco.get(chave) if cache_disco is not None else None
+
+    if resultado is None:
+        # O modelo retorna uma lista de listas, pegamos [0] porque enviamos apenas 1 texto
+        resultado = tuple((r['label'], r['score']) for r in modelo(texto)[0])
+        if cache_disco is not None:
+            cache_disco.set(chave, resultado)
+
+    return resultado
+
+
+async def obter_top_emocoes(texto: str, k: int | None = None) -> tuple:
+    """
+    Retorna apenas as k emoções mais prováveis de um texto.
+
+    Ponto de entrada comum das ferramentas de análise de um único texto. A
+    inferência (ou a busca na cache) roda em uma thread, e como os resultados
+    já vêm ordenados por score, as k primeiras são obtidas com um slice, sem
+    percorrer as demais.
+
+    Args:
+        texto: O texto a ser analisado
+        k: Quantas emoções retornar (None retorna todas as 28)
+
+    Returns:
+        Tupla de pares (rótulo, score) em ordem decrescente de score
+    """
+    # asyncio.to_thread roda a chamada bloqueante em uma thread, liberando o event loop
+    # para atender outras requisições enquanto o modelo processa
+    inferencia = await asyncio.to_thread(inferir_emocoes, texto)
+    return inferencia[:k]
+
+
+def formatar_emocao(label: str, score: float, _traduzir=TRADUCAO_EMOCOES.get, _arredondar=round) -> dict:
+    """
+    Formata uma emoção retornada pelo modelo para a resposta das ferramentas.
+
+    O score é convertido para porcentagem uma única vez e reaproveitado tanto
+    no valor numérico quanto na string formatada.
+
+    Esta função roda uma vez por emoção em cada resposta. Por isso o método de
+    tradução e o round são recebidos como argumentos padrão: viram variáveis
+    locais (LOAD_FAST) em vez de buscas no escopo global a cada chamada.
+
+    Args:
+        label: Nome da emoção em inglês
+        score: Probabilidade da emoção (0 a 1)
+        _traduzir: Uso interno; TRADUCAO_EMOCOES.get ligado na definição da função
+        _arredondar: Uso interno; a função round ligada na definição da função
+
+    Returns:
+        Dicionário com a emoção traduzida, o nome original e a probabilidade
+    """
+    probabilidade = _arredondar(score * 100, 2)  # Score como número (0-100)
+    return {
+        "emocao": _traduzir(label, label),  # Tradução (fallback para original se não encontrar)
+        "emocao_original": label,  # Nome em inglês para referência
+        "probabilidade": probabilidade,
+        "porcentagem": f"{probabilidade}%"  # Score como string formatada
+    }
+
+
 # ============================================================================
 # FERRAMENTA 1: ANÁLISE BÁSICA DE SENTIMENTO
 # ============================================================================
@@ -128,46 +464,31 @@ async def analisar_sentimento(texto: str, top_k: int = 5) -> str:
     Returns:
         JSON string com as emoções detectadas em português e suas probabilidades
     """
-    # Inicializa o modelo (ou recupera da cache se já foi inicializado)
-    modelo = inicializar_modelo()
-
-    # Executa a inferência do modelo no texto
-    # O modelo retorna uma lista de listas, pegamos [0] porque enviamos apenas 1 texto
-    resultados = modelo(texto)[0]
+    # Executa a inferência do modelo no texto (ou recupera da cache se o texto já foi visto)
+    # e formata apenas as top_k emoções mais prováveis; as demais nem são percorridas
+    top_emocoes = [
+        formatar_emocao(label, score)
+        for label, score in await obter_top_emocoes(texto, top_k)
+    ]
 
-    # Ordena as emoções por probabilidade (score) em ordem decrescente
-    # lambda x: x['score'] extrai o valor do score de cada emoção para ordenação
-    resultados_ordenados = sorted(resultados, key=lambda x: x['score'], reverse=True)
-
-    # Slice para pegar apenas as top_k emoções mais prováveis
-    top_resultados = resultados_ordenados[:top_k]
+    # A emoção dominante (a de maior probabilidade) é a primeira já formatada
+    dominante = top_emocoes[0]
 
     # Constrói o dicionário de resposta com informações estruturadas
     resposta = {
         "texto_analisado": texto,  # Echo do texto original
-        "total_emocoes": len(resultados),  # Sempre 28 para GoEmotions
-
-        # List comprehension para formatar cada emoção top
-        "top_emocoes": [
-            {
-                "emocao": TRADUCAO_EMOCOES.get(r['label'], r['label']),  # Tradução (fallback para original se não encontrar)
-                "emocao_original": r['label'],  # Nome em inglês para referência
-                "probabilidade": round(r['score'] * 100, 2),  # Score como número (0-100)
-                "porcentagem": f"{round(r['score'] * 100, 2)}%"  # Score como string formatada
-            }
-            for r in top_resultados
-        ],
-
-        # Informações sobre a emoção dominante (a de maior probabilidade)
-        "emocao_dominante": TRADUCAO_EMOCOES.get(top_resultados[0]['label'], top_resultados[0]['label']),
-        "emocao_dominante_original": top_resultados[0]['label'],
-        "confianca_dominante": f"{round(top_resultados[0]['score'] * 100, 2)}%"
+        "total_emocoes": len(TRADUCAO_EMOCOES),  # Sempre 28 para GoEmotions
+        "top_emocoes": top_emocoes,
+
+        # Informações sobre a emoção dominante
+        "emocao_dominante": dominante["emocao"],
+        "emocao_dominante_original": dominante["emocao_original"],
+        "confianca_dominante": dominante["porcentagem"]
     }
 
-    # Serializa para JSON com:
-    # - indent=2: formatação bonita com indentação
-    # - ensure_ascii=False: permite caracteres UTF-8 (acentos em português)
-    return json.dumps(resposta, indent=2, ensure_ascii=False)
+    # Serializa para JSON com orjson
+    # orjson.dumps retorna bytes UTF-8; .decode() converte para string
+    return orjson.dumps(resposta, option=OPCOES_JSON).decode()
 
 
 # ============================================================================
@@ -189,55 +510,55 @@ async def analisar_sentimento_detalhado(texto: str) -> str:
     Returns:
         JSON string com todas as emoções detectadas, suas probabilidades e agrupamentos
     """
-    # Inicializa o modelo (ou recupera da cache)
-    modelo = inicializar_modelo()
-
-    # Executa a inferência
-    resultados = modelo(texto)[0]
+    # Executa a inferência (ou recupera da cache) e obtém todas as emoções
+    inferencia = await obter_top_emocoes(texto)
 
-    # Ordena por score (probabilidade) decrescente
-    resultados_ordenados = sorted(resultados, key=lambda x: x['score'], reverse=True)
-
-    # Agrupa emoções em três categorias baseadas na probabilidade
+    # Uma única passada pelas 28 emoções (já ordenadas por probabilidade) que, ao mesmo
+    # tempo, formata cada emoção e conta quantas há em cada nível de confiança:
     # - Alta (>=50%): emoções muito presentes no texto
     # - Média (10-50%): emoções moderadamente presentes
     # - Baixa (<10%): emoções fracamente presentes
-    alta_probabilidade = [r for r in resultados_ordenados if r['score'] >= 0.5]
-    media_probabilidade = [r for r in resultados_ordenados if 0.1 <= r['score'] < 0.5]
-    baixa_probabilidade = [r for r in resultados_ordenados if r['score'] < 0.1]
+    todas_emocoes = []
+    n_alta = n_media = n_baixa = 0
+
+    for label, score in inferencia:
+        if score >= 0.5:
+            nivel = "alta"
+            n_alta += 1
+        elif score >= 0.1:
+            nivel = "média"
+            n_media += 1
+        else:
+            nivel = "baixa"
+            n_baixa += 1
+
+        emocao = formatar_emocao(label, score)
+        emocao["nivel"] = nivel  # Classificação ternária do nível de confiança
+        todas_emocoes.append(emocao)
+
+    dominante = todas_emocoes[0]
 
     # Constrói resposta estruturada
     resposta = {
         "texto_analisado": texto,
 
         # Informações sobre a emoção dominante
-        "emocao_dominante": TRADUCAO_EMOCOES.get(resultados_ordenados[0]['label'], resultados_ordenados[0]['label']),
-        "emocao_dominante_original": resultados_ordenados[0]['label'],
-        "confianca_dominante": f"{round(resultados_ordenados[0]['score'] * 100, 2)}%",
+        "emocao_dominante": dominante["emocao"],
+        "emocao_dominante_original": dominante["emocao_original"],
+        "confianca_dominante": dominante["porcentagem"],
 
         # Resumo estatístico da distribuição de emoções
         "resumo": {
-            "emocoes_alta_confianca": len(alta_probabilidade),    # Quantas emoções com score >= 50%
-            "emocoes_media_confianca": len(media_probabilidade),  # Quantas entre 10-50%
-            "emocoes_baixa_confianca": len(baixa_probabilidade)   # Quantas < 10%
+            "emocoes_alta_confianca": n_alta,    # Quantas emoções com score >= 50%
+            "emocoes_media_confianca": n_media,  # Quantas entre 10-50%
+            "emocoes_baixa_confianca": n_baixa   # Quantas < 10%
         },
 
-        # Lista completa de todas as 28 emoções, ordenadas por probabilidade
-        "todas_emocoes": [
-            {
-                "emocao": TRADUCAO_EMOCOES.get(r['label'], r['label']),
-                "emocao_original": r['label'],
-                "probabilidade": round(r['score'] * 100, 2),
-                "porcentagem": f"{round(r['score'] * 100, 2)}%",
-                # Classificação ternária do nível de confiança
-                "nivel": "alta" if r['score'] >= 0.5 else "média" if r['score'] >= 0.1 else "baixa"
-            }
-            for r in resultados_ordenados
-        ]
+        "todas_emocoes": todas_emocoes
     }
 
-    # Retorna JSON formatado com suporte a UTF-8
-    return json.dumps(resposta, indent=2, ensure_ascii=False)
+    # Retorna JSON com suporte a UTF-8
+    return orjson.dumps(resposta, option=OPCOES_JSON).decode()
 
 
 # ============================================================================
@@ -262,19 +583,31 @@ async def comparar_sentimentos(textos: list[str]) -> str:
     Returns:
         JSON string com análise comparativa de todos os textos
     """
-    # Inicializa o modelo
-    modelo = inicializar_modelo()
+    # Inicializa o modelo (ou recupera da cache) em uma thread, já que o primeiro
+    # carregamento é demorado e não pode bloquear o event loop
+    modelo = await asyncio.to_thread(inicializar_modelo)
 
     # Lista para armazenar as análises de cada texto
     analises = []
 
-    # Itera sobre cada texto com índice começando em 1 (mais amigável ao usuário)
-    for idx, texto in enumerate(textos, 1):
-        # Executa a inferência para este texto
-        resultados = modelo(texto)[0]
-
-        # Ordena emoções por probabilidade
-        resultados_ordenados = sorted(resultados, key=lambda x: x['score'], reverse=True)
+    # Executa a inferência de todos os textos em uma única chamada
+    # O pipeline agrupa os textos em lotes (batch_size) e faz um forward pass por lote,
+    # em vez de um forward pass por texto
+    # - num_workers=0: carrega os lotes no próprio processo (sem workers do DataLoader)
+    # - asyncio.to_thread: executa o lote em uma thread, sem bloquear o event loop
+    resultados_lote = await asyncio.to_thread(
+        modelo,
+        textos,
+        batch_size=min(32, len(textos)) or 1,
+        num_workers=0
+    )
+
+    # Itera sobre cada texto (e seus resultados) com índice começando em 1 (mais amigável ao usuário)
+    # Os resultados de cada texto já vêm ordenados por probabilidade
+    for idx, (texto, resultados_ordenados) in enumerate(zip(textos, resultados_lote), 1):
+        # Formata as top 3 emoções uma única vez (a primeira é a dominante)
+        top_3 = [formatar_emocao(r['label'], r['score']) for r in resultados_ordenados[:3]]
+        dominante = top_3[0]
 
         # Adiciona análise deste texto à lista
         analises.append({
@@ -282,19 +615,19 @@ async def comparar_sentimentos(textos: list[str]) -> str:
             "texto": texto,  # O texto original
 
             # Informações sobre a emoção mais forte
-            "emocao_dominante": TRADUCAO_EMOCOES.get(resultados_ordenados[0]['label'], resultados_ordenados[0]['label']),
-            "emocao_dominante_original": resultados_ordenados[0]['label'],
-            "confianca": f"{round(resultados_ordenados[0]['score'] * 100, 2)}%",
+            "emocao_dominante": dominante["emocao"],
+            "emocao_dominante_original": dominante["emocao_original"],
+            "confianca": dominante["porcentagem"],
 
             # Top 3 emoções para dar contexto adicional
             # (útil quando a dominante não é tão forte ou há emoções mistas)
             "top_3_emocoes": [
                 {
-                    "emocao": TRADUCAO_EMOCOES.get(r['label'], r['label']),
-                    "emocao_original": r['label'],
-                    "probabilidade": f"{round(r['score'] * 100, 2)}%"
+                    "emocao": e["emocao"],
+                    "emocao_original": e["emocao_original"],
+                    "probabilidade": e["porcentagem"]
                 }
-                for r in resultados_ordenados[:3]  # Slice para pegar apenas as 3 primeiras
+                for e in top_3
             ]
         })
 
@@ -304,8 +637,8 @@ async def comparar_sentimentos(textos: list[str]) -> str:
         "analises": analises  # Lista com análise individual de cada texto
     }
 
-    # Retorna JSON formatado
-    return json.dumps(resposta, indent=2, ensure_ascii=False)
+    # Retorna JSON
+    return orjson.dumps(resposta, option=OPCOES_JSON).decode()
 
 
 # ============================================================================
@@ -319,16 +652,25 @@ if __name__ == "__main__":
 
     Fluxo de inicialização:
     1. Carrega o modelo GoEmotions na memória
-    2. Inicia o servidor MCP na porta 8080
-    3. Fica aguardando requisições dos clientes MCP
+    2. Executa inferências de aquecimento (warmup)
+    3. Inicia o servidor MCP na porta 8080
+    4. Fica aguardando requisições dos clientes MCP
     """
 
     # Pré-carrega o modelo antes de aceitar conexões
     # Isso evita delay na primeira requisição (que seria mais lenta)
-    inicializar_modelo()
+    modelo = inicializar_modelo()
+
+    # Aquecimento: a primeira inferência ainda paga a inicialização preguiçosa dos
+    # kernels (CUDA/MKL/ONNX Runtime); rodamos uma com 1 texto e outra com um lote
+    # completo para que a primeira requisição real já encontre tudo pronto
+    modelo("warmup")
+    modelo(["warmup"] * 16)
 
     # Inicia o servidor MCP usando Server-Sent Events (SSE)
     # - transport='sse': usa SSE para comunicação (streaming unidirecional do servidor)
+    #   As respostas SSE já saem com "X-Accel-Buffering: no", então proxies reversos
+    #   (nginx, Envoy, Cloud Run) repassam os eventos sem acumulá-los
     # - port=8080: porta onde o servidor ficará escutando
     # O servidor ficará rodando até ser interrompido (Ctrl+C)
     servidor_mcp.run(transport='sse', port=8080)